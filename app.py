@@ -262,9 +262,59 @@ def load_company_df(company: str) -> pd.DataFrame:
 def save_response(company: str, rec: dict):
     company = _sanitize_company_name(company)
     df_old = load_company_df(company)
+    q_old = load_company_quality(company, df_old)
     df_new = pd.concat([df_old, pd.DataFrame([rec])], ignore_index=True)
     out = DATA_DIR/company/"responses.csv"
     df_new.to_csv(out, index=False)
+    # امتیاز کیفیت فقط برای همین رکورد جدید محاسبه و به فایل کیفیت اضافه می‌شود
+    q_new = score_quality(pd.DataFrame([rec]), seen=set(zip(q_old["respondent_key"], q_old["answer_sig"])))
+    q_new["row"] = len(df_old)
+    pd.concat([q_old, q_new], ignore_index=True)[QUALITY_COLS].to_csv(DATA_DIR/company/"quality.csv", index=False)
+
+# ---------------- کیفیت پاسخ‌ها (یک‌بار در زمان ثبت) ----------------
+# straight_line: همهٔ ۴۰ موضوع با یک گزینهٔ بلوغ پاسخ داده شده‌اند
+# duplicate: همان پاسخ‌دهنده قبلاً دقیقاً همین پاسخ‌ها را ثبت کرده (امضای هش‌شدهٔ پاسخ‌ها)
+QUALITY_COLS = ["row","respondent_key","answer_sig","mat_var","straight_line","duplicate","low_quality"]
+
+def score_quality(df: pd.DataFrame, seen: Optional[set] = None) -> pd.DataFrame:
+    """امتیاز کیفیت برداری برای همهٔ ردیف‌ها؛ seen = جفت‌های (respondent_key, answer_sig) ثبت‌شدهٔ قبلی."""
+    mat_cols = [f"t{t['id']}_maturity" for t in TOPICS]
+    ans_cols = mat_cols + [f"t{t['id']}_rel" for t in TOPICS]
+    ans = df.reindex(columns=ans_cols).apply(pd.to_numeric, errors="coerce").fillna(-1).astype("int64")
+    mat = ans[mat_cols].to_numpy(dtype=float)
+    resp = df.reindex(columns=["respondent"])["respondent"].fillna("").astype(str).str.strip()
+    sig = pd.util.hash_pandas_object(ans, index=False).map(lambda h: f"{h:016x}")
+    q = pd.DataFrame({
+        "row": np.arange(len(df)),
+        "respondent_key": resp.to_numpy(),
+        "answer_sig": sig.to_numpy(),
+        "mat_var": mat.var(axis=1) if len(df) else np.array([], dtype=float),
+        "straight_line": (mat == mat[:, :1]).all(axis=1) if len(df) else np.array([], dtype=bool),
+    })
+    named = q["respondent_key"] != ""
+    dup = named & q.duplicated(subset=["respondent_key","answer_sig"], keep="first")
+    if seen:
+        dup |= named & pd.Series([k in seen for k in zip(q["respondent_key"], q["answer_sig"])], index=q.index)
+    q["duplicate"] = dup
+    q["low_quality"] = q["straight_line"] | q["duplicate"]
+    return q[QUALITY_COLS]
+
+def load_company_quality(company: str, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """فایل کیفیت کنار responses.csv؛ اگر نبود یا با داده هم‌خوان نبود، یک‌جا بازمحاسبه می‌شود."""
+    company = _sanitize_company_name(company)
+    if df is None:
+        df = load_company_df(company)
+    p = DATA_DIR/company/"quality.csv"
+    if p.exists():
+        q = pd.read_csv(p, dtype={"respondent_key": str, "answer_sig": str}, keep_default_na=False)
+        if len(q) == len(df) and set(QUALITY_COLS) <= set(q.columns):
+            for c in ("straight_line","duplicate","low_quality"):
+                q[c] = q[c].astype(str).str.lower().eq("true")
+            return q[QUALITY_COLS]
+    q = score_quality(df)
+    if len(df):
+        q.to_csv(p, index=False)
+    return q
 
 def get_company_logo_path(company: str) -> Optional[Path]:
     folder = DATA_DIR / _sanitize_company_name(company)
@@ -491,6 +541,18 @@ with tabs[1]:
         st.info("برای این شرکت پاسخی وجود ندارد.")
         st.stop()
 
+    # کیفیت پاسخ‌ها (پرچم‌ها از قبل در quality.csv محاسبه شده‌اند)
+    quality = load_company_quality(company, df)
+    low_q = quality["low_quality"].to_numpy(dtype=bool)
+    exclude_low_q = st.checkbox(
+        f"حذف پاسخ‌های کم‌کیفیت ({int(quality['straight_line'].sum())} پاسخ یکنواخت، {int(quality['duplicate'].sum())} پاسخ تکراری)",
+        value=False, key="exclude_low_q")
+    if exclude_low_q:
+        df = df[~low_q].reset_index(drop=True)
+        if df.empty:
+            st.info("پس از حذف پاسخ‌های کم‌کیفیت، پاسخی باقی نمانده است.")
+            st.stop()
+
     # خلاصه مشارکت
     st.markdown('<div class="panel"><h4>خلاصه مشارکت شرکت</h4>', unsafe_allow_html=True)
     total_n = len(df)